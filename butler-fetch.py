@@ -1,21 +1,28 @@
 #!/usr/bin/env python3
-from flask import Flask, request, redirect, url_for, send_file, jsonify
+from flask import Flask, request, redirect, url_for, send_file
 import sys, os
+import stat
+import tempfile
 import json
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import socket
-from urllib.parse import quote
+from io import BytesIO
+from urllib.parse import quote, urlparse, urlunparse, parse_qs, urlencode
 from datetime import datetime
 from datetime import timezone
 import re
-import imaplib
 import email
 from email.header import decode_header
 from email.utils import parsedate_to_datetime
-from dateutil import parser
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from tzlocal import get_localzone
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import LRUCache, TTLCache
 
 APP_VERSION = "1.0.1"
 
@@ -25,6 +32,13 @@ def resource_path(relative_path):
     return os.path.join(os.path.abspath("."), relative_path)
 
 app = Flask(__name__)
+# Templates and JS only change between app versions; let the browser reuse them briefly
+STATIC_MAX_AGE = 300
+app.config["SEND_FILE_MAX_AGE_DEFAULT"] = STATIC_MAX_AGE
+
+def json_response(payload):
+    """jsonify() equivalent that serializes with orjson"""
+    return app.response_class(orjson.dumps(payload), mimetype="application/json")
 
 BUNDLED_USER_CONFIG = resource_path("user_config.json")
 def user_config_path():
@@ -45,6 +59,43 @@ HEADERS = {
     "User-Agent": "canvas-dashboard-local-script"
 }
 
+RETRY_AFTER_CAP = 5  # seconds; a request thread may be holding a single-flight slot while it waits
+
+class _CappedRetry(Retry):
+    """Retry that honours Retry-After but never sleeps longer than RETRY_AFTER_CAP"""
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, RETRY_AFTER_CAP)
+
+# Shared session: pooled keep-alive connections plus backoff on rate limits / gateway errors.
+# Retries are for the listed statuses; timeouts aren't retried (one connect retry only) so a
+# dead host can't hold a server thread for several full timeouts.
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=_CappedRetry(
+        total=3,
+        connect=1,
+        read=0,
+        status=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 502, 503, 504],
+        respect_retry_after_header=True,  # Open-Meteo/RSS hosts; Canvas throttles with 403 (see canvas_get)
+        raise_on_status=False
+    )
+)
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+CANVAS_MAX_WORKERS = 8
+ANNOUNCEMENT_PAGE_WORKERS = 4
+CANVAS_THROTTLE_RETRIES = 2
+# Caps Canvas requests in flight across all worker threads (Canvas throttles per token)
+_CANVAS_SLOTS = threading.BoundedSemaphore(CANVAS_MAX_WORKERS)
+# One shared pool for announcement pages, so per-course workers never spawn pools of their own
+_CANVAS_PAGE_EXECUTOR = ThreadPoolExecutor(max_workers=ANNOUNCEMENT_PAGE_WORKERS, thread_name_prefix="canvas-page")
+
 DEFAULT_CONFIG = {
     "canvas": {
         "enabled": False,
@@ -100,22 +151,81 @@ def ensure_user_config_exists():
             except Exception as e:
                 print(f"[WARN] Default config load failed: {e}")
                 config_to_write = DEFAULT_CONFIG
-        with open(USER_CONFIG_FILE, "w", encoding="utf-8") as f:
-            json.dump(config_to_write, f, indent=4)
+        save_config(config_to_write)
     else:
         # Keep app version synced automatically so users never have to set it manually.
         try:
-            with open(USER_CONFIG_FILE, "r", encoding="utf-8") as f:
-                existing = json.load(f)
+            existing = load_config()
             updates = existing.get("updates") or {}
             if updates.get("current_version") != APP_VERSION:
-                updates["current_version"] = APP_VERSION
-                existing["updates"] = updates
-                with open(USER_CONFIG_FILE, "w", encoding="utf-8") as f:
-                    json.dump(existing, f, indent=4)
+                # load_config() hands out a shared dict, so write a copy with the new version
+                synced = {**existing, "updates": {**updates, "current_version": APP_VERSION}}
+                save_config(synced)
         except Exception as e:
             print(f"[WARN] Could not sync app version in config: {e}")
 
+# Parsed user config, re-read only when the file on disk changes
+_CONFIG_CACHE = {"stamp": None, "data": None, "bytes": None}
+_CONFIG_LOCK = threading.Lock()
+
+def load_config():
+    """Return the parsed user config, re-parsing only when the file's mtime/size changes.
+    The returned dict is shared between requests and must not be mutated."""
+    st = os.stat(USER_CONFIG_FILE)
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _CONFIG_LOCK:
+        if _CONFIG_CACHE["stamp"] != stamp:
+            with open(USER_CONFIG_FILE, "rb") as f:
+                raw = f.read()
+            _CONFIG_CACHE["data"] = orjson.loads(raw)
+            _CONFIG_CACHE["bytes"] = raw
+            _CONFIG_CACHE["stamp"] = stamp
+        return _CONFIG_CACHE["data"]
+
+def _write_config_file(blob):
+    """Atomically replace USER_CONFIG_FILE with blob, keeping the file's permissions"""
+    try:
+        mode = stat.S_IMODE(os.stat(USER_CONFIG_FILE).st_mode)
+    except FileNotFoundError:
+        mode = 0o600  # holds the Canvas token and app passwords
+    # mkstemp creates the file 0600 in the target directory, so os.replace stays on one filesystem
+    fd, tmp_path = tempfile.mkstemp(prefix=".user_config.", suffix=".tmp", dir=os.path.dirname(USER_CONFIG_FILE) or ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        for attempt in range(3):
+            try:
+                os.replace(tmp_path, USER_CONFIG_FILE)
+                return
+            except PermissionError:
+                # Windows refuses the rename while another handle (e.g. a /user_config.json send) is open
+                time.sleep(0.05 * (attempt + 1))
+        with open(USER_CONFIG_FILE, "wb") as f:
+            f.write(blob)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def save_config(config):
+    """Write the user config atomically (temp file + rename), skipping the write if nothing changed"""
+    blob = json.dumps(config, indent=4).encode("utf-8")
+    with _CONFIG_LOCK:
+        try:
+            st = os.stat(USER_CONFIG_FILE)
+            on_disk = (st.st_mtime_ns, st.st_size) == _CONFIG_CACHE["stamp"]
+        except FileNotFoundError:
+            on_disk = False
+        if on_disk and _CONFIG_CACHE["bytes"] == blob:
+            return
+        _write_config_file(blob)
+        st = os.stat(USER_CONFIG_FILE)
+        _CONFIG_CACHE["data"] = orjson.loads(blob)
+        _CONFIG_CACHE["bytes"] = blob
+        _CONFIG_CACHE["stamp"] = (st.st_mtime_ns, st.st_size)
+
 def is_port_in_use(port, host="127.0.0.1"):
     try:
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
@@ -124,22 +234,35 @@ def is_port_in_use(port, host="127.0.0.1"):
     except Exception:
         return False
 
-# Cache for API responses (in-memory with timestamp)
-API_CACHE = {
-    "weather": {"data": None, "timestamp": 0},
-    "news": {"data": None, "timestamp": 0},
-    "emails": {"data": None, "timestamp": 0}
-}
+# Cache for API responses (in-memory, bounded, entries expire after their TTL)
 CACHE_TTL = 300  # 5 minutes in seconds
+CANVAS_CACHE_TTL = 60  # assignments/announcements change more often than weather/news
+API_CACHE = TTLCache(maxsize=256, ttl=CACHE_TTL)
+CANVAS_CACHE = TTLCache(maxsize=32, ttl=CANVAS_CACHE_TTL)
+# ETag/Last-Modified plus parsed payload per upstream URL; outlives the TTL caches so expired
+# entries can be revalidated with a conditional GET instead of re-downloaded
+VALIDATOR_CACHE = LRUCache(maxsize=512)
+_CACHE_LOCK = threading.RLock()
 
 # ---------------------------
 # Canvas Helpers
 # ---------------------------
+_COURSE_TRAILER_RE = re.compile(r"\s*-\s*[A-Za-z]?\d{1,4}[A-Za-z]?\b.*$")
+_COURSE_CODE_RE = re.compile(r"([A-Za-z]{2,5})[- ]?(\d{1,3}[A-Za-z]?)")
+_WS_RE = re.compile(r"\s+")
+_NON_ACADEMIC_RE = re.compile(r"program|organization|guardian|nextup", re.IGNORECASE)
+_COURSE_NAME_FILLERS = frozenset({"introduction", "intro", "beginning", "fundamentals", "basic", "advanced"})
+
 def normalize_dt(dt_str):
     if not dt_str:
         return datetime.min.replace(tzinfo=timezone.utc)
 
-    dt = parser.isoparse(dt_str)
+    try:
+        # Canvas timestamps are RFC 3339, which the stdlib parser handles much faster than dateutil
+        dt = datetime.fromisoformat(dt_str.replace("Z", "+00:00"))
+    except ValueError:
+        from dateutil import parser
+        dt = parser.isoparse(dt_str)
 
     # Canvas mixes tz-aware and tz-naive timestamps
     if dt.tzinfo is None:
@@ -159,19 +282,18 @@ def shorten_course_name(full_course_name):
     name = name.replace("(", " (")
     name = name.split("(")[0].strip()
     name = name.strip(" -")
-    name = re.sub(r"\s*-\s*[A-Za-z]?\d{1,4}[A-Za-z]?\b.*$", "", name).strip()
+    name = _COURSE_TRAILER_RE.sub("", name).strip()
 
     # Rule 1: detect course code
-    m = re.search(r"([A-Za-z]{2,5})[- ]?(\d{1,3}[A-Za-z]?)", name)
+    m = _COURSE_CODE_RE.search(name)
     if m:
         return f"{m.group(1).upper()} {m.group(2).upper()}"
 
     # Rule 2: remove filler words and shorten
-    fillers = {"introduction", "intro", "beginning", "fundamentals", "basic", "advanced"}
-    words = [w for w in re.split(r"\s+", name) if w]
+    words = [w for w in _WS_RE.split(name) if w]
     cleaned = []
     for w in words:
-        if w.lower().strip(",.:-") in fillers:
+        if w.lower().strip(",.:-") in _COURSE_NAME_FILLERS:
             continue
         cleaned.append(w.strip(",.:-"))
     if not cleaned:
@@ -187,13 +309,25 @@ def shorten_course_name(full_course_name):
         result = result[:16].rstrip() + "…"
     return result
 
+def _is_canvas_throttled(r):
+    # Canvas rate limiting is a 403, not a 429, so the session's Retry never sees it
+    return r.status_code == 403 and b"Rate Limit Exceeded" in r.content
+
+def canvas_get(url, token, **kwargs):
+    """SESSION.get for Canvas: limits concurrent Canvas requests and backs off when throttled"""
+    headers = {**(kwargs.pop("headers", None) or {}), "Authorization": f"Bearer {token}"}
+    for attempt in range(CANVAS_THROTTLE_RETRIES + 1):
+        with _CANVAS_SLOTS:
+            r = SESSION.get(url, headers=headers, **kwargs)
+        if not _is_canvas_throttled(r) or attempt == CANVAS_THROTTLE_RETRIES:
+            break
+        print(f"[DEBUG] Canvas rate limit hit (remaining {r.headers.get('X-Rate-Limit-Remaining')}), backing off")
+        time.sleep(1 + attempt)
+    return r
+
 def test_token(token):
     try:
-        r = requests.get(
-            f"{BASE_URL}/users/self/profile",
-            headers={**HEADERS, "Authorization": f"Bearer {token}"},
-            timeout=10
-        )
+        r = canvas_get(f"{BASE_URL}/users/self/profile", token, timeout=10)
         return r.status_code == 200
     except Exception:
         return False
@@ -211,55 +345,184 @@ def looks_like_canvas_token(token):
     return True
 
 def get_courses(token):
+    """Returns the active course list, or None if Canvas couldn't be read"""
     try:
-        r = requests.get(
-            f"{BASE_URL}/courses?enrollment_state=active&per_page=100",
-            headers={**HEADERS, "Authorization": f"Bearer {token}"},
-            timeout=10
-        )
+        r = canvas_get(f"{BASE_URL}/courses?enrollment_state=active&per_page=100", token, timeout=10)
         r.raise_for_status()
-        return r.json()
-    except Exception:
-        return []
+        return orjson.loads(r.content)
+    except Exception as e:
+        print(f"[DEBUG] Canvas courses fetch failed: {e}")
+        return None
 
 def get_assignments(course_id, token):
+    """Returns the course's assignments, or None if Canvas couldn't be read"""
     try:
-        r = requests.get(
+        r = canvas_get(
             f"{BASE_URL}/courses/{course_id}/assignments",
+            token,
             params={"per_page": 100, "include[]": "submission"},
-            headers={**HEADERS, "Authorization": f"Bearer {token}"},
             timeout=10
         )
         r.raise_for_status()
-        return r.json()
-    except Exception:
-        return []
+        return orjson.loads(r.content)
+    except Exception as e:
+        print(f"[DEBUG] Canvas assignments fetch failed for course {course_id}: {e}")
+        return None
+
+def _get_canvas_page(url, token, params=None):
+    """GET one page of a Canvas list endpoint; returns (items, links), or (None, {}) on failure"""
+    try:
+        page = _conditional_get(
+            url,
+            ("canvas", token, url, tuple(sorted((params or {}).items()))),
+            lambda r: (orjson.loads(r.content), r.links),
+            get=lambda u, **kw: canvas_get(u, token, **kw),
+            params=params,
+            timeout=10
+        )
+        if page is not None:
+            return page
+        print(f"[DEBUG] Canvas page fetch failed: {url}")
+    except Exception as e:
+        print(f"[DEBUG] Canvas page fetch failed: {url}: {e}")
+    return None, {}
+
+def _remaining_page_urls(last_url):
+    """Expand a numbered rel="last" link into URLs for pages 2..N (None if pages aren't numbered)"""
+    if not last_url:
+        return None
+    parsed = urlparse(last_url)
+    query = parse_qs(parsed.query, keep_blank_values=True)
+    last_page = (query.get("page") or [""])[0]
+    if not last_page.isdigit():
+        return None
+    urls = []
+    for page in range(2, int(last_page) + 1):
+        query["page"] = [str(page)]
+        urls.append(urlunparse(parsed._replace(query=urlencode(query, doseq=True))))
+    return urls
+
+def _fetch_announcements(course_id, token):
+    """Returns (announcements, complete); complete is False if any page failed to load"""
+    batch, links = _get_canvas_page(
+        f"{BASE_URL}/courses/{course_id}/discussion_topics",
+        token,
+        params={"only_announcements": "true", "per_page": 50}
+    )
+    if batch is None:
+        return [], False
+    course_announcements = list(batch)
+    next_url = links.get("next", {}).get("url")
+    if not next_url:
+        return course_announcements, True
+
+    # Numbered pagination: the last link tells us every page, so fetch them in parallel
+    page_urls = _remaining_page_urls(links.get("last", {}).get("url"))
+    if page_urls:
+        complete = True
+        for page_batch, _ in _CANVAS_PAGE_EXECUTOR.map(lambda u: _get_canvas_page(u, token), page_urls):
+            if page_batch is None:
+                complete = False
+            else:
+                course_announcements.extend(page_batch)
+        return course_announcements, complete
+
+    # Bookmark pagination (no usable last link): follow next links in order
+    while next_url:
+        batch, links = _get_canvas_page(next_url, token)
+        if batch is None:
+            return course_announcements, False
+        course_announcements.extend(batch)
+        next_url = links.get("next", {}).get("url")
+    return course_announcements, True
 
 def is_real_academic_course(course):
-    name = (course.get("name") or "").lower()
-    return not any(k in name for k in ["program", "organization", "guardian", "nextup"])
+    name = course.get("name") or ""
+    return _NON_ACADEMIC_RE.search(name) is None
 
 # ---------------------------
 # Cache Helper
 # ---------------------------
+def _cache_for(key):
+    return CANVAS_CACHE if key.startswith("canvas:") else API_CACHE
+
 def get_cached(key):
     """Returns cached data if fresh (within TTL), else None"""
-    if key in API_CACHE:
-        cached = API_CACHE[key]
-        if time.time() - cached["timestamp"] < CACHE_TTL:
-            return cached["data"]
-    return None
+    with _CACHE_LOCK:
+        return _cache_for(key).get(key)
 
 def set_cache(key, data):
-    """Store data in cache with current timestamp"""
-    API_CACHE[key] = {"data": data, "timestamp": time.time()}
+    """Store data in cache; it expires after the cache's TTL"""
+    with _CACHE_LOCK:
+        _cache_for(key)[key] = data
+
+# In-progress upstream fetches, so concurrent cache misses share a single fetch
+_INFLIGHT = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+def _single_flight(key, fetch):
+    """Run fetch() for key unless one is already running; callers that join share its result"""
+    with _INFLIGHT_LOCK:
+        flight = _INFLIGHT.get(key)
+        leader = flight is None
+        if leader:
+            flight = _INFLIGHT[key] = {"done": threading.Event(), "result": None, "error": None}
+    if not leader:
+        flight["done"].wait()
+        if flight["error"] is not None:
+            raise flight["error"]
+        return flight["result"]
+    try:
+        flight["result"] = fetch()
+        return flight["result"]
+    except Exception as e:
+        flight["error"] = e
+        raise
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(key, None)
+        flight["done"].set()
+
+def _conditional_get(url, cache_key, parse, get=None, **kwargs):
+    """GET with If-None-Match/If-Modified-Since from the last 200 response for cache_key.
+    Returns parse(response) on 200, the previously parsed payload on 304, else None."""
+    with _CACHE_LOCK:
+        stored = VALIDATOR_CACHE.get(cache_key)
+    headers = dict(kwargs.pop("headers", None) or {})
+    if stored:
+        etag, last_modified, _ = stored
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+    r = (get or SESSION.get)(url, headers=headers, **kwargs)
+    if r.status_code == 304 and stored:
+        return stored[2]
+    if r.status_code != 200:
+        return None
+    data = parse(r)
+    etag = r.headers.get("ETag")
+    last_modified = r.headers.get("Last-Modified")
+    if etag or last_modified:
+        with _CACHE_LOCK:
+            VALIDATOR_CACHE[cache_key] = (etag, last_modified, data)
+    return data
 
 # ---------------------------
 # Gmail IMAP Helper
 # ---------------------------
+GMAIL_FETCH_SPEC = (
+    "(BODY.PEEK[HEADER.FIELDS (FROM SUBJECT DATE MESSAGE-ID CONTENT-TYPE CONTENT-TRANSFER-ENCODING)] "
+    "BODY.PEEK[TEXT]<0.2048>)"
+)
+_FETCH_SEQ_RE = re.compile(rb"^(\d+) \(")
+
 def _decode_mime_header(value):
     if not value:
         return ""
+    # RFC 2047 encoded words always contain "=?"; plain headers need no decoding
+    if isinstance(value, str) and "=?" not in value:
+        return value.strip()
     parts = decode_header(value)
     decoded = []
     for part, enc in parts:
@@ -296,6 +559,38 @@ def _extract_snippet(msg, limit=140):
             return ""
     return ""
 
+def _partial_snippet(msg, partial, limit=140):
+    """Snippet straight from a partial single-part body; "" when it needs full MIME decoding"""
+    if not partial or msg.is_multipart() or msg.get_content_maintype() != "text":
+        return ""
+    encoding = (msg.get("Content-Transfer-Encoding") or "7bit").strip().lower()
+    if encoding not in ("7bit", "8bit", "binary"):
+        return ""
+    try:
+        text = partial.decode(msg.get_content_charset() or "utf-8", errors="replace")
+    except LookupError:
+        text = partial.decode("utf-8", errors="replace")
+    return " ".join(text.split())[:limit]
+
+def _group_fetch_response(msg_data):
+    """Split a multi-message FETCH response into {msg_id: {"header": ..., "text": ...}}"""
+    messages = {}
+    current = None
+    for item in msg_data:
+        if not isinstance(item, tuple):
+            continue
+        desc, payload = item
+        m = _FETCH_SEQ_RE.match(desc)
+        if m:
+            current = messages.setdefault(m.group(1), {"header": b"", "text": b""})
+        if current is None:
+            continue
+        if b"HEADER" in desc.upper():
+            current["header"] = payload or b""
+        else:
+            current["text"] = payload or b""
+    return messages
+
 def fetch_gmail_unread(account, limit=5):
     email_addr = (account.get("email") or "").strip()
     app_password = (account.get("app_password") or "").strip()
@@ -304,6 +599,8 @@ def fetch_gmail_unread(account, limit=5):
     if not email_addr or not app_password:
         return []
 
+    import imaplib
+
     items = []
     try:
         imap = imaplib.IMAP4_SSL(host, port)
@@ -321,12 +618,23 @@ def fetch_gmail_unread(account, limit=5):
             return []
         ids = data[0].split()
         latest_ids = ids[-limit:]
+        if not latest_ids:
+            imap.logout()
+            return []
+        # One pipelined FETCH for all messages, headers plus the start of the body only.
+        status, msg_data = imap.fetch(b",".join(latest_ids), GMAIL_FETCH_SPEC)
+        if status != "OK":
+            imap.logout()
+            return []
+        fetched = _group_fetch_response(msg_data)
         for msg_id in reversed(latest_ids):
-            status, msg_data = imap.fetch(msg_id, "(RFC822)")
-            if status != "OK":
+            parts = fetched.get(msg_id)
+            if not parts:
                 continue
-            raw = msg_data[0][1]
-            msg = email.message_from_bytes(raw)
+            msg = email.message_from_bytes(parts["header"])
+            snippet = _partial_snippet(msg, parts["text"])
+            if not snippet:
+                snippet = _extract_snippet(email.message_from_bytes(parts["header"] + parts["text"]))
             from_val = _decode_mime_header(msg.get("From"))
             subject_val = _decode_mime_header(msg.get("Subject"))
             message_id = (msg.get("Message-ID") or "").strip()
@@ -348,7 +656,7 @@ def fetch_gmail_unread(account, limit=5):
             items.append({
                 "sender": from_val,
                 "subject": subject_val,
-                "snippet": _extract_snippet(msg),
+                "snippet": snippet,
                 "timestamp": timestamp,
                 "message_id": clean_message_id,
                 "url": email_url,
@@ -367,6 +675,7 @@ def test_gmail_connection(account):
     port = int(account.get("imap_port") or 993)
     if not email_addr or not app_password:
         return False, "Missing email or app password"
+    import imaplib
     try:
         imap = imaplib.IMAP4_SSL(host, port)
         imap.login(email_addr, app_password)
@@ -380,79 +689,90 @@ def get_gmail_data(config):
     accounts = (config.get("emails") or {}).get("accounts", [])
     if not accounts:
         return []
-    results = []
+    gmail_accounts = []
     for acc in accounts:
         email_addr = (acc.get("email") or "").lower()
         host = (acc.get("imap_host") or "imap.gmail.com").lower()
         if "gmail.com" in email_addr or "gmail" in host:
-            items = fetch_gmail_unread(acc, limit=5)
-            for item in items:
-                item["account"] = acc.get("label") or acc.get("email") or "Gmail"
-            results.extend(items)
+            gmail_accounts.append(acc)
+    if not gmail_accounts:
+        return []
+    # Each worker opens its own IMAP connection; nothing is shared between threads.
+    with ThreadPoolExecutor(max_workers=len(gmail_accounts)) as ex:
+        per_account = list(ex.map(lambda a: fetch_gmail_unread(a, limit=5), gmail_accounts))
+    results = []
+    for acc, items in zip(gmail_accounts, per_account):
+        for item in items:
+            item["account"] = acc.get("label") or acc.get("email") or "Gmail"
+        results.extend(items)
     return results[:5]
 
 # ---------------------------
 # Weather Helper (Open-Meteo)
 # ---------------------------
-def get_weather(zip_code, lat=None, lon=None):
-    """Fetch weather from Open-Meteo using ZIP code (no API key required)"""
-    cached = get_cached("weather")
-    if cached:
-        return cached
-    
-    def weather_code_to_text(code):
-        mapping = {
-            0: "Clear",
-            1: "Mainly clear",
-            2: "Partly cloudy",
-            3: "Overcast",
-            45: "Fog",
-            48: "Depositing rime fog",
-            51: "Light drizzle",
-            53: "Drizzle",
-            55: "Dense drizzle",
-            56: "Freezing drizzle",
-            57: "Freezing drizzle",
-            61: "Slight rain",
-            63: "Rain",
-            65: "Heavy rain",
-            66: "Freezing rain",
-            67: "Freezing rain",
-            71: "Slight snow",
-            73: "Snow",
-            75: "Heavy snow",
-            77: "Snow grains",
-            80: "Rain showers",
-            81: "Rain showers",
-            82: "Violent rain showers",
-            85: "Snow showers",
-            86: "Snow showers",
-            95: "Thunderstorm",
-            96: "Thunderstorm with hail",
-            99: "Thunderstorm with hail"
-        }
-        return mapping.get(code, "Unknown")
+WEATHER_CODE_MAP = {
+    0: "Clear",
+    1: "Mainly clear",
+    2: "Partly cloudy",
+    3: "Overcast",
+    45: "Fog",
+    48: "Depositing rime fog",
+    51: "Light drizzle",
+    53: "Drizzle",
+    55: "Dense drizzle",
+    56: "Freezing drizzle",
+    57: "Freezing drizzle",
+    61: "Slight rain",
+    63: "Rain",
+    65: "Heavy rain",
+    66: "Freezing rain",
+    67: "Freezing rain",
+    71: "Slight snow",
+    73: "Snow",
+    75: "Heavy snow",
+    77: "Snow grains",
+    80: "Rain showers",
+    81: "Rain showers",
+    82: "Violent rain showers",
+    85: "Snow showers",
+    86: "Snow showers",
+    95: "Thunderstorm",
+    96: "Thunderstorm with hail",
+    99: "Thunderstorm with hail"
+}
+
+# Resolved (tzinfo, tz_id) per Open-Meteo timezone name; None is the no-timezone fallback
+_TZ_CACHE = {}
 
-    def resolve_timezone(tz_name):
+def _resolve_timezone(tz_name):
+    resolved = _TZ_CACHE.get(tz_name)
+    if resolved is None:
         if tz_name:
             try:
-                return ZoneInfo(tz_name), tz_name
+                resolved = (ZoneInfo(tz_name), tz_name)
             except ZoneInfoNotFoundError:
                 local_tz = get_localzone()
-                return local_tz, str(local_tz)
-        try:
-            fallback_tz = ZoneInfo("America/Los_Angeles")
-            return fallback_tz, "America/Los_Angeles"
-        except ZoneInfoNotFoundError:
-            local_tz = get_localzone()
-            return local_tz, str(local_tz)
-
-    def with_local_time(payload, tz_name=None):
-        tz, tz_id = resolve_timezone(tz_name)
-        payload.setdefault("timezone", tz_id)
-        payload["local_time"] = datetime.now(tz).isoformat()
-        return payload
+                resolved = (local_tz, str(local_tz))
+        else:
+            resolved = (PACIFIC, str(PACIFIC))
+        _TZ_CACHE[tz_name] = resolved
+    return resolved
+
+def _with_local_time(payload, tz_name=None):
+    tz, tz_id = _resolve_timezone(tz_name)
+    payload.setdefault("timezone", tz_id)
+    payload["local_time"] = datetime.now(tz).isoformat()
+    return payload
+
+def get_weather(zip_code, lat=None, lon=None):
+    """Fetch weather from Open-Meteo using ZIP code (no API key required)"""
+    cached = get_cached("weather")
+    if cached:
+        return cached
+    # Failure payloads aren't cached, so joiners must reuse the leader's result rather than refetch
+    return _single_flight("weather", lambda: _fetch_weather(zip_code, lat=lat, lon=lon))
 
+def _fetch_weather(zip_code, lat=None, lon=None):
     try:
         if not os.path.exists(USER_CONFIG_FILE):
             print("[WARN] user_config.json missing; weather may be unavailable.")
@@ -461,27 +781,28 @@ def get_weather(zip_code, lat=None, lon=None):
     
     try:
         if not zip_code:
-            return with_local_time({"temp": "N/A", "condition": "No location set"})
+            return _with_local_time({"temp": "N/A", "condition": "No location set"})
         
         location_name = ""
         if lat is None or lon is None:
             # Step 1: Geocode ZIP code to lat/lon using Open-Meteo Geocoding API
-            geo_r = requests.get(
+            geo_r = SESSION.get(
                 "https://geocoding-api.open-meteo.com/v1/search",
                 params={"name": zip_code, "count": 1, "language": "en"},
                 timeout=5
             )
             
-            if geo_r.status_code != 200 or not geo_r.json().get("results"):
-                return with_local_time({"temp": "N/A", "condition": "Location not found"})
+            geo_results = orjson.loads(geo_r.content).get("results") if geo_r.status_code == 200 else None
+            if not geo_results:
+                return _with_local_time({"temp": "N/A", "condition": "Location not found"})
             
-            result = geo_r.json()["results"][0]
+            result = geo_results[0]
             lat = result.get("latitude")
             lon = result.get("longitude")
             location_name = result.get("name", "")
         
         # Step 2: Fetch weather from Open-Meteo Weather API
-        weather_r = requests.get(
+        weather_r = SESSION.get(
             "https://api.open-meteo.com/v1/forecast",
             params={
                 "latitude": lat,
@@ -494,7 +815,7 @@ def get_weather(zip_code, lat=None, lon=None):
         )
         
         if weather_r.status_code == 200:
-            data = weather_r.json()
+            data = orjson.loads(weather_r.content)
             current = data.get("current", {})
             code = current.get("weather_code")
             if code is not None:
@@ -502,34 +823,90 @@ def get_weather(zip_code, lat=None, lon=None):
                     code = int(code)
                 except Exception:
                     code = None
+            temp = current.get("temperature_2m")
             weather = {
-                "temp": int(current.get("temperature_2m")) if current.get("temperature_2m") is not None else "N/A",
-                "condition": weather_code_to_text(code) if code is not None else "Unknown",
+                "temp": int(temp) if temp is not None else "N/A",
+                "condition": WEATHER_CODE_MAP.get(code, "Unknown"),
                 "humidity": current.get("relative_humidity_2m"),
                 "location": location_name,
                 "timezone": data.get("timezone")
             }
-            weather = with_local_time(weather, weather.get("timezone"))
+            weather = _with_local_time(weather, weather.get("timezone"))
             set_cache("weather", weather)
             return weather
         else:
-            return with_local_time({"temp": "N/A", "condition": "Unable to fetch"})
+            return _with_local_time({"temp": "N/A", "condition": "Unable to fetch"})
     except Exception as e:
         print(f"[DEBUG] Weather fetch error: {e}")
-        return with_local_time({"temp": "N/A", "condition": "Error fetching weather"})
+        return _with_local_time({"temp": "N/A", "condition": "Error fetching weather"})
 
 # ---------------------------
 # News Helper (RSS-Based)
 # ---------------------------
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+
+def _parse_feed(source_name, content, limit=2):
+    """Return the top items of an RSS/Atom document (stops parsing once it has them)"""
+    from lxml import etree
+
+    items = []
+    seen = 0
+    ctx = etree.iterparse(
+        BytesIO(content),
+        events=("end",),
+        tag=("item", f"{ATOM_NS}entry"),
+        resolve_entities=False
+    )
+    for _, elem in ctx:
+        if elem.tag == "item":
+            title = elem.findtext("title")
+            link = elem.findtext("link")
+            if title is not None and link is not None:
+                items.append({
+                    "title": title or "Untitled",
+                    "source": source_name,
+                    "url": link,
+                    "published": elem.findtext("pubDate") or ""
+                })
+        else:
+            # Atom fallback
+            link_elem = elem.find(f"{ATOM_NS}link")
+            href = link_elem.get("href") if link_elem is not None else ""
+            items.append({
+                "title": elem.findtext(f"{ATOM_NS}title") or "Untitled",
+                "source": source_name,
+                "url": href or "",
+                "published": elem.findtext(f"{ATOM_NS}updated") or ""
+            })
+        elem.clear()
+        seen += 1
+        if seen >= limit:
+            break
+    return items
+
+def _fetch_feed(source_name, feed_url):
+    """Fetch one RSS/Atom feed (conditionally, so unchanged feeds aren't re-parsed)"""
+    try:
+        items = _conditional_get(
+            feed_url,
+            ("feed", feed_url),
+            lambda r: _parse_feed(source_name, r.content),
+            timeout=5
+        )
+        return items or []
+    except Exception as e:
+        print(f"[DEBUG] Error fetching {source_name} RSS: {e}")
+        return []
+
 def get_news():
     """Fetch news from RSS feeds (no API key required)"""
     cached = get_cached("news")
     if cached:
         return cached
-    
+    return _single_flight("news", _fetch_news)
+
+def _fetch_news():
     try:
-        import xml.etree.ElementTree as ET
-        
         # Default RSS feed sources
         feeds = [
             ("Reuters", "https://feeds.reuters.com/reuters/worldNews"),
@@ -540,49 +917,16 @@ def get_news():
             ("Al Jazeera", "https://www.aljazeera.com/xml/rss/all.xml")
         ]
         
-        items = []
-        for source_name, feed_url in feeds:
-            try:
-                r = requests.get(feed_url, headers=HEADERS, timeout=5)
-                if r.status_code == 200:
-                    root = ET.fromstring(r.content)
-                    # Parse RSS items
-                    rss_items = root.findall(".//item")
-                    if rss_items:
-                        for item in rss_items[:2]:  # Top 2 from each feed
-                            title_elem = item.find("title")
-                            link_elem = item.find("link")
-                            pub_date_elem = item.find("pubDate")
-                            
-                            if title_elem is not None and link_elem is not None:
-                                items.append({
-                                    "title": title_elem.text or "Untitled",
-                                    "source": source_name,
-                                    "url": link_elem.text or "",
-                                    "published": pub_date_elem.text if pub_date_elem is not None else ""
-                                })
-                    else:
-                        # Atom fallback
-                        for entry in root.findall(".//{http://www.w3.org/2005/Atom}entry")[:2]:
-                            title_elem = entry.find("{http://www.w3.org/2005/Atom}title")
-                            link_elem = entry.find("{http://www.w3.org/2005/Atom}link")
-                            updated_elem = entry.find("{http://www.w3.org/2005/Atom}updated")
-                            href = link_elem.get("href") if link_elem is not None else ""
-                            items.append({
-                                "title": title_elem.text if title_elem is not None else "Untitled",
-                                "source": source_name,
-                                "url": href or "",
-                                "published": updated_elem.text if updated_elem is not None else ""
-                            })
-            except Exception as e:
-                print(f"[DEBUG] Error fetching {source_name} RSS: {e}")
-                continue
+        # Feeds are independent, so fetch and parse them concurrently
+        with ThreadPoolExecutor(max_workers=len(feeds)) as ex:
+            per_feed = list(ex.map(lambda sf: _fetch_feed(*sf), feeds))
+        items = [item for feed_items in per_feed for item in feed_items]
         
         # Sort by published date (newest first) and limit to 5
         try:
             items_sorted = sorted(
                 items,
-                key=lambda x: parser.isoparse(x["published"]) if x["published"] else datetime.min.replace(tzinfo=timezone.utc),
+                key=lambda x: normalize_dt(x["published"]),
                 reverse=True
             )[:5]
         except:
@@ -619,8 +963,7 @@ def index():
     ensure_user_config_exists()
     # Check if user has configured Canvas
     if os.path.exists(USER_CONFIG_FILE):
-        with open(USER_CONFIG_FILE, "r", encoding="utf-8") as f:
-            config = json.load(f)
+        config = load_config()
         
         canvas_config = config.get("canvas", {})
         if canvas_config.get("enabled") and canvas_config.get("token"):
@@ -628,28 +971,29 @@ def index():
             return redirect(url_for("dashboard"))
     
     # No config or Canvas not enabled, show welcome
-    return send_file(resource_path("templates/welcome.html"))
+    # (revalidated every time: "/" switches to a redirect once Canvas is configured)
+    return send_file(resource_path("templates/welcome.html"), max_age=0, conditional=True)
 
 @app.route("/welcome")
 def welcome():
-    return send_file(resource_path("templates/welcome.html"))
+    return send_file(resource_path("templates/welcome.html"), max_age=STATIC_MAX_AGE, conditional=True)
 
 @app.route("/dashboard")
 def dashboard():
-    return send_file(resource_path("templates/dashboard.html"))
+    return send_file(resource_path("templates/dashboard.html"), max_age=STATIC_MAX_AGE, conditional=True)
 
 @app.route("/user_config.json")
 def get_user_config():
     ensure_user_config_exists()
-    return send_file(USER_CONFIG_FILE, mimetype="application/json")
+    # no-cache + ETag: the browser revalidates every time and gets a 304 while the file is unchanged
+    return send_file(USER_CONFIG_FILE, mimetype="application/json", max_age=0, conditional=True)
 
 @app.route("/save_preferences", methods=["POST"])
 def save_preferences():
     existing_config = {}
     if os.path.exists(USER_CONFIG_FILE):
         try:
-            with open(USER_CONFIG_FILE, "r", encoding="utf-8") as f:
-                existing_config = json.load(f)
+            existing_config = load_config()
         except Exception:
             existing_config = {}
 
@@ -783,25 +1127,25 @@ def save_preferences():
         if test_token(canvas_token):
             config["canvas"]["courses"] = []
             config["canvas"]["assignments"] = []
-            courses = get_courses(canvas_token)
+            courses = [c for c in (get_courses(canvas_token) or []) if is_real_academic_course(c)]
+            with ThreadPoolExecutor(max_workers=max(1, min(CANVAS_MAX_WORKERS, len(courses)))) as ex:
+                assignment_lists = list(ex.map(lambda c: get_assignments(c["id"], canvas_token), courses))
             assignments_all = []
-            for c in courses:
-                if is_real_academic_course(c):
-                    alias = course_aliases.get(str(c.get("id")), "")
-                    c_display = alias if alias else get_display_name(c.get("name", "Unnamed Course"))
-                    config["canvas"]["courses"].append({
-                        "id": c["id"],
-                        "name": c_display,
-                        "full_name": c.get("name", "Unnamed Course")
+            for c, assignment_list in zip(courses, assignment_lists):
+                alias = course_aliases.get(str(c.get("id")), "")
+                c_display = alias if alias else get_display_name(c.get("name", "Unnamed Course"))
+                config["canvas"]["courses"].append({
+                    "id": c["id"],
+                    "name": c_display,
+                    "full_name": c.get("name", "Unnamed Course")
+                })
+                for a in assignment_list or []:
+                    assignments_all.append({
+                        "course": c_display,
+                        "name": a.get("name", "Unnamed Assignment"),
+                        "due_at": a.get("due_at"),
+                        "submission": a.get("submission", {})
                     })
-                    assignment_list = get_assignments(c["id"], canvas_token)
-                    for a in assignment_list:
-                        assignments_all.append({
-                            "course": c_display,
-                            "name": a.get("name", "Unnamed Assignment"),
-                            "due_at": a.get("due_at"),
-                            "submission": a.get("submission", {})
-                        })
             # Sort by due date, upcoming first
             config["canvas"]["assignments"] = sorted(
                 assignments_all,
@@ -812,59 +1156,55 @@ def save_preferences():
             print("[DEBUG] Canvas token invalid")
 
     # ✅ SAVE TO DISK
-    with open(USER_CONFIG_FILE, "w", encoding="utf-8") as f:
-        json.dump(config, f, indent=4)
+    save_config(config)
 
     # ✅ SEND USER TO DASHBOARD
     return redirect(url_for("dashboard"))
 
 @app.route("/dashboard.js")
 def dashboard_js():
-    return send_file(resource_path("static/dashboard.js"), mimetype="application/javascript")
+    return send_file(resource_path("static/dashboard.js"), mimetype="application/javascript", max_age=STATIC_MAX_AGE, conditional=True)
 
 @app.route("/health")
 def health():
-    return jsonify({"ok": True, "timestamp": datetime.now(timezone.utc).isoformat()})
+    return json_response({"ok": True, "timestamp": datetime.now(timezone.utc).isoformat()})
 
 @app.route("/weather")
 def weather():
     if not os.path.exists(USER_CONFIG_FILE):
-        return jsonify({"temp": "N/A", "condition": "Not configured"})
+        return json_response({"temp": "N/A", "condition": "Not configured"})
     
-    with open(USER_CONFIG_FILE, "r", encoding="utf-8") as f:
-        config = json.load(f)
+    config = load_config()
     
     loc = config.get("location", {})
     zip_code = loc.get("zip_code", "")
     lat = loc.get("lat") or None
     lon = loc.get("lon") or None
     weather_data = get_weather(zip_code, lat=lat, lon=lon)
-    return jsonify(weather_data)
+    return json_response(weather_data)
 
 @app.route("/news")
 def news():
     news_data = get_news()
-    return jsonify(news_data)
+    return json_response(news_data)
 
 @app.route("/gmail_data")
 def gmail_data():
     if not os.path.exists(USER_CONFIG_FILE):
-        return jsonify({"items": []})
-    with open(USER_CONFIG_FILE, "r", encoding="utf-8") as f:
-        config = json.load(f)
+        return json_response({"items": []})
+    config = load_config()
     items = get_gmail_data(config)
-    return jsonify({"items": items})
+    return json_response({"items": items})
 
 @app.route("/connection_status")
 def connection_status():
     if not os.path.exists(USER_CONFIG_FILE):
-        return jsonify({
+        return json_response({
             "canvas": {"configured": False, "connected": False, "message": "Not configured"},
             "email": {"configured": False, "connected": False, "message": "Not configured"}
         })
 
-    with open(USER_CONFIG_FILE, "r", encoding="utf-8") as f:
-        config = json.load(f)
+    config = load_config()
 
     canvas_cfg = (config.get("canvas") or {})
     canvas_enabled = bool(canvas_cfg.get("enabled"))
@@ -901,7 +1241,7 @@ def connection_status():
         else:
             email_message = "Unable to connect"
 
-    return jsonify({
+    return json_response({
         "canvas": {
             "configured": canvas_configured,
             "connected": canvas_connected,
@@ -918,32 +1258,40 @@ def connection_status():
 @app.route("/canvas_data")
 def canvas_data():
     if not os.path.exists(USER_CONFIG_FILE):
-        return jsonify({"assignments": [], "announcements": []})
+        return json_response({"assignments": [], "announcements": []})
 
-    with open(USER_CONFIG_FILE, "r", encoding="utf-8") as f:
-        config = json.load(f)
+    config = load_config()
 
     canvas_config = config.get("canvas", {})
     token = canvas_config.get("token")
     if not token or not test_token(token):
-        return jsonify({"assignments": [], "announcements": []})
+        return json_response({"assignments": [], "announcements": []})
 
     aliases = (config.get("canvas", {}) or {}).get("course_aliases", {})
     aliases_fingerprint = json.dumps(aliases, sort_keys=True)
     cache_key = f"canvas:{token}:{aliases_fingerprint}"
     cached = get_cached(cache_key)
     if cached:
-        return jsonify(cached)
+        return json_response(cached)
 
     # Fetch courses
     courses_raw = get_courses(token)
-    courses = [c for c in courses_raw if is_real_academic_course(c)]
+    complete = courses_raw is not None
+    courses = [c for c in (courses_raw or []) if is_real_academic_course(c)]
+
+    # Assignments and announcements are fetched per course, concurrently
+    with ThreadPoolExecutor(max_workers=max(1, min(CANVAS_MAX_WORKERS, len(courses)))) as ex:
+        assignment_results = ex.map(lambda c: get_assignments(c["id"], token), courses)
+        announcement_results = ex.map(lambda c: _fetch_announcements(c["id"], token), courses)
+        assignment_lists = list(assignment_results)
+        announcement_lists = list(announcement_results)
+    # A partial payload (throttled/failed fetches) is served but not cached
+    complete = complete and all(a is not None for a in assignment_lists) and all(ok for _, ok in announcement_lists)
 
     # Assignments
     assignments = []
-    for c in courses:
-        a_list = get_assignments(c["id"], token)
-        for a in a_list:
+    for c, a_list in zip(courses, assignment_lists):
+        for a in a_list or []:
             display_name = aliases.get(str(c.get("id")), "") or get_display_name(c["name"])
             assignments.append({
                 "course": display_name,
@@ -960,28 +1308,7 @@ def canvas_data():
 
     # Announcements
     announcements = []
-    for c in courses:
-        url = f"{BASE_URL}/courses/{c['id']}/discussion_topics"
-        params = {"only_announcements": "true", "per_page": 50}
-        course_announcements = []
-        while url:
-            try:
-                r = requests.get(
-                    url,
-                    headers={**HEADERS, "Authorization": f"Bearer {token}"},
-                    params=params,
-                    timeout=10
-                )
-                if r.status_code != 200:
-                    break
-                batch = r.json()
-                course_announcements.extend(batch)
-                url = r.links.get("next", {}).get("url")
-                params = None
-                time.sleep(0.1)
-            except Exception:
-                break
-
+    for c, (course_announcements, _) in zip(courses, announcement_lists):
         # Deduplicate and pick latest 2 announcements
         dedup = {}
         for a in course_announcements:
@@ -1005,8 +1332,9 @@ def canvas_data():
             })
 
     payload = {"assignments": assignments, "announcements": announcements}
-    set_cache(cache_key, payload)
-    return jsonify(payload)
+    if complete:
+        set_cache(cache_key, payload)
+    return json_response(payload)
 
 # ---------------------------
 # Run server
@@ -1014,15 +1342,13 @@ def canvas_data():
 if __name__ == "__main__":
     try:
         os.makedirs(os.path.dirname(USER_CONFIG_FILE), exist_ok=True) if os.path.dirname(USER_CONFIG_FILE) else None
-        import threading
         import webbrowser
 
         try:
             if not os.path.exists(USER_CONFIG_FILE):
                 print("[WARN] user_config.json missing; weather will be unavailable.")
             else:
-                with open(USER_CONFIG_FILE, "r", encoding="utf-8") as f:
-                    config = json.load(f)
+                config = load_config()
         except Exception as e:
             print(f"[WARN] Startup config check failed: {e}")
 
@@ -1046,6 +1372,11 @@ if __name__ == "__main__":
         print(f"[WARN] Startup wrapper error: {e}")
 
     try:
-        app.run(debug=False, host="127.0.0.1", port=DEFAULT_PORT, use_reloader=False)
+        if os.environ.get("BUTLER_DEV"):
+            app.run(debug=True, host="127.0.0.1", port=DEFAULT_PORT, use_reloader=False)
+        else:
+            # Multi-threaded server so dashboard endpoints polled together don't queue behind each other
+            from waitress import serve
+            serve(app, host="127.0.0.1", port=DEFAULT_PORT, threads=8)
     except Exception as e:
         print(f"[ERROR] Server failed to start: {e}")